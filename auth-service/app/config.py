@@ -52,6 +52,8 @@ class Settings(BaseSettings):
     log_format: str = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
     log_file_max_bytes: int = 10485760  # 10MB
     log_file_backup_count: int = 5
+    log_buffer_capacity: int = 4096  # Records buffered per log file before a write
+    log_flush_interval: float = 1.0  # Max seconds a buffered record waits, even with no further logging
 
     model_config = ConfigDict(env_file=".env", extra="ignore")
 
@@ -1,9 +1,136 @@
+import atexit
 import logging
 import logging.handlers
+import orjson
 import os
+import queue
+import time
 from pathlib import Path
 from .config import settings
 
+# Background listeners that write queued records to the real file handlers
+_queue_listeners = []
+
+class BufferedFileHandler(logging.handlers.MemoryHandler):
+    """
+    MemoryHandler that writes its buffer to the target when it is full, on
+    WARNING and above (failed logins and other audit events), or once
+    flush_interval seconds have passed since the last write. While no
+    records arrive, TimedFlushQueueListener triggers the timed flush.
+    """
+
+    def __init__(self, target, capacity, flush_interval):
+        super().__init__(capacity, flushLevel=logging.WARNING, target=target)
+        self.flush_interval = flush_interval
+        self._last_flush = time.monotonic()
+
+    def emit(self, record):
+        # MemoryHandler.flush() bypasses the target's level, so filter here
+        if record.levelno >= self.target.level:
+            super().emit(record)
+
+    def shouldFlush(self, record):
+        return (
+            super().shouldFlush(record)
+            or time.monotonic() - self._last_flush >= self.flush_interval
+        )
+
+    def flush(self):
+        super().flush()
+        self._last_flush = time.monotonic()
+
+    def close(self):
+        # MemoryHandler.close() flushes and drops the target without closing it
+        target = self.target
+        super().close()
+        if target is not None:
+            target.close()
+
+class TimedFlushQueueListener(logging.handlers.QueueListener):
+    """
+    QueueListener that flushes its handlers whenever the queue has been idle
+    for flush_interval seconds, so buffered records reach disk even when no
+    further records arrive to trigger BufferedFileHandler.shouldFlush().
+    """
+
+    def __init__(self, queue, *handlers, flush_interval, respect_handler_level=False):
+        super().__init__(queue, *handlers, respect_handler_level=respect_handler_level)
+        self.flush_interval = flush_interval
+        self.running = False
+
+    def start(self):
+        super().start()
+        self.running = True
+
+    def stop(self):
+        super().stop()
+        self.running = False
+
+    def dequeue(self, block):
+        if not block:
+            return super().dequeue(block)
+        while True:
+            try:
+                return self.queue.get(timeout=self.flush_interval)
+            except queue.Empty:
+                # Runs on the listener thread, the only writer to these buffers
+                for handler in self.handlers:
+                    handler.flush()
+
+class JsonLinesFormatter(logging.Formatter):
+    """
+    Format each record as one JSON object per line, with the logger name as
+    a field so a single file can hold every logger's output.
+    """
+
+    def format(self, record):
+        entry = {
+            "timestamp": self.formatTime(record),
+            "logger": record.name,
+            "level": record.levelname,
+            "message": record.getMessage(),
+        }
+        if record.levelno >= logging.ERROR:
+            entry["location"] = f"{record.filename}:{record.lineno}"
+        # Tracebacks arrive already folded into the message by QueueHandler.prepare()
+        return orjson.dumps(entry, default=str).decode()
+
+def queued_handler(*handlers):
+    """
+    Put file handlers behind a QueueHandler so logging calls on the request
+    path only enqueue the record; a QueueListener thread does the disk I/O,
+    batching writes through a BufferedFileHandler per file.
+    """
+    log_queue = queue.Queue(-1)
+    buffered = [
+        BufferedFileHandler(handler, settings.log_buffer_capacity, settings.log_flush_interval)
+        for handler in handlers
+    ]
+    listener = TimedFlushQueueListener(
+        log_queue, *buffered,
+        flush_interval=settings.log_flush_interval,
+        respect_handler_level=True
+    )
+    listener.start()
+    _queue_listeners.append(listener)
+    return logging.handlers.QueueHandler(log_queue)
+
+def start_log_listeners():
+    """Restart any queue listeners stopped by a previous shutdown."""
+    for listener in _queue_listeners:
+        if not listener.running:
+            listener.start()
+
+def stop_log_listeners():
+    """Flush queued and buffered records to disk and stop the listener threads."""
+    for listener in _queue_listeners:
+        if listener.running:
+            listener.stop()
+        for handler in listener.handlers:
+            handler.flush()
+
+atexit.register(stop_log_listeners)
+
 def setup_logging():
     """
     Configure logging for the FastAPI application.
@@ -16,8 +143,14 @@ def setup_logging():
     root_logger = logging.getLogger()
     root_logger.setLevel(getattr(logging, settings.log_level.upper(), logging.INFO))
     
-    # Clear any existing handlers
+    # Clear any existing handlers, stopping the listeners and closing the
+    # files behind a previous call's queue handler
     root_logger.handlers.clear()
+    stop_log_listeners()
+    for listener in _queue_listeners:
+        for handler in listener.handlers:
+            handler.close()
+    _queue_listeners.clear()
     
     # Console handler for general logs
     console_handler = logging.StreamHandler()
@@ -26,72 +159,21 @@ def setup_logging():
     console_handler.setLevel(logging.INFO)
     root_logger.addHandler(console_handler)
     
-    # File handler for application logs with rotation
-    app_log_file = logs_dir / "app.log"
+    # Single JSON-lines file for every logger; filter by the "logger" field
+    log_file = logs_dir / "app.jsonl"
     file_handler = logging.handlers.RotatingFileHandler(
-        app_log_file,
+        log_file,
         maxBytes=settings.log_file_max_bytes,
         backupCount=settings.log_file_backup_count,
         encoding='utf-8'
     )
-    file_formatter = logging.Formatter(settings.log_format)
-    file_handler.setFormatter(file_formatter)
+    file_handler.setFormatter(JsonLinesFormatter())
     file_handler.setLevel(getattr(logging, settings.log_level.upper(), logging.INFO))
-    root_logger.addHandler(file_handler)
-    
-    # Error log file handler
-    error_log_file = logs_dir / "error.log"
-    error_handler = logging.handlers.RotatingFileHandler(
-        error_log_file,
-        maxBytes=settings.log_file_max_bytes,
-        backupCount=settings.log_file_backup_count,
-        encoding='utf-8'
-    )
-    error_formatter = logging.Formatter(
-        "%(asctime)s - %(name)s - %(levelname)s - %(filename)s:%(lineno)d - %(message)s"
-    )
-    error_handler.setFormatter(error_formatter)
-    error_handler.setLevel(logging.ERROR)
-    root_logger.addHandler(error_handler)
+    root_logger.addHandler(queued_handler(file_handler))
     
-    # OAuth service logger
-    oauth_logger = logging.getLogger("fastapi.oauth")
-    oauth_file = logs_dir / "oauth.log"
-    oauth_handler = logging.handlers.RotatingFileHandler(
-        oauth_file,
-        maxBytes=settings.log_file_max_bytes,
-        backupCount=settings.log_file_backup_count,
-        encoding='utf-8'
-    )
-    oauth_handler.setFormatter(file_formatter)
-    oauth_logger.addHandler(oauth_handler)
-    oauth_logger.setLevel(logging.INFO)
-    
-    # Authentication service logger
-    auth_logger = logging.getLogger("fastapi.auth")
-    auth_file = logs_dir / "auth.log"
-    auth_handler = logging.handlers.RotatingFileHandler(
-        auth_file,
-        maxBytes=settings.log_file_max_bytes,
-        backupCount=settings.log_file_backup_count,
-        encoding='utf-8'
-    )
-    auth_handler.setFormatter(file_formatter)
-    auth_logger.addHandler(auth_handler)
-    auth_logger.setLevel(logging.INFO)
-    
-    # Database logger
-    db_logger = logging.getLogger("fastapi.database")
-    db_file = logs_dir / "database.log"
-    db_handler = logging.handlers.RotatingFileHandler(
-        db_file,
-        maxBytes=settings.log_file_max_bytes,
-        backupCount=settings.log_file_backup_count,
-        encoding='utf-8'
-    )
-    db_handler.setFormatter(file_formatter)
-    db_logger.addHandler(db_handler)
-    db_logger.setLevel(logging.INFO)
+    # Service loggers propagate to the root handlers
+    for name in ("fastapi.oauth", "fastapi.auth", "fastapi.database"):
+        logging.getLogger(name).setLevel(logging.INFO)
     
     # Suppress overly verbose third-party loggers
     logging.getLogger("urllib3").setLevel(logging.WARNING)
@@ -1,11 +1,12 @@
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
 import logging
 from .database import engine, Base
 from .routes.auth import router as auth_router
 from .config import settings
-from .logging_config import setup_logging
+from .logging_config import setup_logging, start_log_listeners, stop_log_listeners
 from .middleware import RequestLoggingMiddleware
 
 # Setup logging system
@@ -14,6 +15,9 @@ logger = setup_logging()
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Handle application startup and shutdown events."""
+    # Startup: Make sure the background log writers are running
+    start_log_listeners()
+
     # Startup: Create database tables
     try:
         Base.metadata.create_all(bind=engine)
@@ -24,15 +28,16 @@ async def lifespan(app: FastAPI):
 
     yield
 
-    # Shutdown: Clean up resources if needed
-    pass
+    # Shutdown: Flush queued log records to disk
+    stop_log_listeners()
 
 app = FastAPI(
     title="FastAPI Authentication Service",
     description="OAuth 2.0 / OpenID Connect authentication service for FastAPI",
     version="1.1.2",
     lifespan=lifespan,
-    root_path=settings.root_path
+    root_path=settings.root_path,
+    default_response_class=ORJSONResponse
 )
 
 # Add request logging middleware
@@ -1,6 +1,7 @@
 import time
 import logging
-import json
+import orjson
+import re
 from typing import Callable
 from fastapi import Request, Response
 from fastapi.routing import APIRoute
@@ -9,21 +10,47 @@ from starlette.responses import Response as StarletteResponse
 import asyncio
 from ..config import settings
 
-# Configure request/response logger
+# Configure request/response logger; records propagate to the root handlers
 request_logger = logging.getLogger("fastapi.requests")
-request_handler = logging.FileHandler("/app/logs/requests.log")
-request_formatter = logging.Formatter(
-    "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
-)
-request_handler.setFormatter(request_formatter)
-request_logger.addHandler(request_handler)
 request_logger.setLevel(logging.INFO)
 
+# Paths passed straight through without logging, to reduce noise
+_SKIP_PATHS = frozenset({"/health", "/", "/docs", "/openapi.json"})
+_SKIP_PREFIXES = ("/docs/",)  # e.g. /docs/oauth2-redirect
+
+# Values are masked for any key containing one of these (case-insensitive).
+# The pattern is lowercase and matched against key.lower(), which is much
+# faster than an IGNORECASE pattern.
+_SENSITIVE_KEYS = frozenset(k.lower() for k in (
+    "password", "token", "secret", "key", "authorization",
+    "refresh_token", "access_token", "client_secret", "api_key"
+))
+_SENSITIVE_KEY_RE = re.compile("|".join(map(re.escape, sorted(_SENSITIVE_KEYS))))
+
+# Request log entries are written as JSON arrays in this field order
+LOG_SCHEMA = (
+    "type", "method", "path", "status", "process_time", "ts",
+    "client_ip", "user_agent", "error"
+)
+
+def _mask_value(value):
+    """Keep only the last 4 characters of a non-empty string value."""
+    if not isinstance(value, str) or not value:
+        return value
+    return f"***{value[-4:]}" if len(value) > 4 else "***"
+
+def _decode(record) -> dict:
+    """Expand a request log entry (a JSON array) into a dict keyed by LOG_SCHEMA."""
+    return dict(zip(LOG_SCHEMA, record))
+
 class RequestLoggingMiddleware(BaseHTTPMiddleware):
     """
     Middleware to log HTTP requests and responses with configurable logging.
     """
     
+    # Read on every request; a slot avoids the instance dict lookup
+    __slots__ = ("enable_request_logging",)
+    
     def __init__(self, app, enable_request_logging: bool = True):
         super().__init__(app)
         self.enable_request_logging = enable_request_logging
@@ -34,7 +61,8 @@ class RequestLoggingMiddleware(BaseHTTPMiddleware):
             return await call_next(request)
             
         # Skip logging for health checks to reduce noise
-        if request.url.path in ["/health", "/", "/docs", "/openapi.json"]:
+        path = request.url.path
+        if path in _SKIP_PATHS or path.startswith(_SKIP_PREFIXES):
             return await call_next(request)
         
         # Start timing
@@ -58,61 +86,60 @@ class RequestLoggingMiddleware(BaseHTTPMiddleware):
         return response
     
     async def _extract_request_data(self, request: Request) -> dict:
-        """Extract relevant request data for logging."""
+        """Extract the request fields that are logged (see LOG_SCHEMA)."""
+        # Plain scope reads; dispatch has already read the path
+        method = request.method
+        path = request.url.path
+        
+        # Only the client and header lookups are guarded
         try:
-            # Get basic request info without consuming the body
-            return {
-                "method": request.method,
-                "url": str(request.url),
-                "path": request.url.path,
-                "query_params": dict(request.query_params),
-                "headers": dict(request.headers),
-                "client_ip": request.client.host if request.client else "unknown",
-                "user_agent": request.headers.get("user-agent", "unknown"),
-                "body": None  # Skip body reading to avoid consuming it
-            }
+            client_ip = request.client.host if request.client else "unknown"
+            user_agent = request.headers.get("user-agent", "unknown")
         except Exception as e:
             return {
-                "method": request.method,
-                "url": str(request.url),
+                "method": method,
+                "path": path,
                 "error": f"Error extracting request data: {str(e)}"
             }
+        
+        return {
+            "method": method,
+            "path": path,
+            "client_ip": client_ip,
+            "user_agent": user_agent,
+        }
     
     def _extract_response_data(self, response: Response, process_time: float) -> dict:
-        """Extract relevant response data for logging."""
+        """Extract the response fields that are logged (see LOG_SCHEMA)."""
         return {
             "status_code": response.status_code,
-            "headers": dict(response.headers),
             "process_time": round(process_time, 4)
         }
     
     def _mask_sensitive_data(self, data: dict) -> dict:
         """Mask sensitive data in request/response bodies."""
-        sensitive_fields = [
-            "password", "token", "secret", "key", "authorization",
-            "refresh_token", "access_token", "client_secret", "api_key"
-        ]
-        
-        masked_data = data.copy()
-        for field in sensitive_fields:
-            for key in masked_data:
-                if isinstance(key, str) and field.lower() in key.lower():
-                    if isinstance(masked_data[key], str) and masked_data[key]:
-                        masked_data[key] = f"***{masked_data[key][-4:]}" if len(masked_data[key]) > 4 else "***"
-        
-        return masked_data
+        match = _SENSITIVE_KEY_RE.search
+        return {
+            key: _mask_value(value) if isinstance(key, str) and match(key.lower()) else value
+            for key, value in data.items()
+        }
     
     def _log_request_response(self, request_data: dict, response_data: dict):
         """Log the request and response data."""
-        log_entry = {
-            "type": "http_request",
-            "request": request_data,
-            "response": response_data,
-            "timestamp": time.time()
-        }
+        log_entry = (
+            "http_request",
+            request_data.get("method"),
+            request_data.get("path"),
+            response_data.get("status_code"),
+            response_data.get("process_time"),
+            time.time(),
+            request_data.get("client_ip"),
+            request_data.get("user_agent"),
+            request_data.get("error")
+        )
         
-        # Log as JSON for structured logging
-        request_logger.info(json.dumps(log_entry, default=str, indent=2))
+        # Log as a flat JSON array (see LOG_SCHEMA) for structured logging
+        request_logger.info(orjson.dumps(log_entry, default=str).decode())
 
 
 class DetailedLoggingRoute(APIRoute):
@@ -7,15 +7,24 @@ from ..services.oauth_service import OAuthService
 from ..services.token_service import TokenService
 from ..middleware.auth_middleware import get_current_user, verify_api_token
 from ..config import settings
+from .base import ORJSONRoute
 from pydantic import BaseModel, field_validator
 from urllib.parse import quote, unquote
+import hashlib
+import hmac
+import json
 import logging
+import orjson
+import os
 import re
 import secrets
 
 # Use auth-specific logger
 logger = logging.getLogger("fastapi.auth")
 
+# Allowed characters for backup login usernames
+_USERNAME_RE = re.compile(r'^[a-zA-Z0-9_.-]+$')
+
 class BackupLoginRequest(BaseModel):
     username: str
     password: str
@@ -29,7 +38,7 @@ class BackupLoginRequest(BaseModel):
             raise ValueError('Username cannot be empty')
         if len(v) > 50:
             raise ValueError('Username too long')
-        if not re.match(r'^[a-zA-Z0-9_.-]+$', v):
+        if not _USERNAME_RE.match(v):
             raise ValueError('Username contains invalid characters')
         return v.strip()
 
@@ -52,13 +61,47 @@ class RefreshTokenRequest(BaseModel):
             raise ValueError('Refresh token cannot be empty')
         return v.strip()
 
-router = APIRouter(tags=["Authentication"])
+router = APIRouter(tags=["Authentication"], route_class=ORJSONRoute)
 auth_service = AuthService()
 oauth_service = OAuthService()
 token_service = TokenService()
 
+def get_oauth_service() -> OAuthService:
+    """Provide the shared OAuthService (override via app.dependency_overrides in tests)."""
+    return oauth_service
+
+def _decode_password_hash(password_hash: str) -> bytes:
+    """Decode a hex SHA-256 password hash; malformed values never match."""
+    try:
+        return bytes.fromhex(password_hash)
+    except (TypeError, ValueError):
+        return b""
+
+def _parse_backup_users(backup_users_json: str) -> dict:
+    """Parse BACKUP_USERS, pre-decoding password hashes.
+
+    Parsed on every call: orjson is cheaper than caching plus copying, and
+    each login gets its own dicts (permissions end up in ORM rows and responses).
+    """
+    # orjson.JSONDecodeError subclasses json.JSONDecodeError
+    backup_users = orjson.loads(backup_users_json)
+    if isinstance(backup_users, dict):
+        for user_config in backup_users.values():
+            user_config["password_digest"] = _decode_password_hash(user_config.get("password_hash"))
+    return backup_users
+
+def _verify(password: str, expected_digest: bytes) -> bool:
+    """Check a backup password against its stored SHA-256 digest."""
+    provided_digest = hashlib.sha256(password.encode()).digest()
+    # Secure comparison to prevent timing attacks
+    return hmac.compare_digest(provided_digest, expected_digest)
+
 @router.get("/login/{provider}")
-async def login(provider: str, request: Request):
+async def login(
+    provider: str,
+    request: Request,
+    oauth_service: OAuthService = Depends(get_oauth_service)
+):
     """Initiate OAuth login flow."""
     if provider not in ["github", "google"]:
         raise HTTPException(status_code=400, detail="Unsupported provider")
@@ -106,7 +149,8 @@ async def auth_callback(
     provider: str,
     code: str,
     state: str,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db),
+    oauth_service: OAuthService = Depends(get_oauth_service)
 ):
     """Handle OAuth callback for specific provider."""
     logger = logging.getLogger(__name__)
@@ -224,10 +268,6 @@ async def auth_callback(
 @router.post("/backup-login")
 async def backup_login(request: BackupLoginRequest, db: Session = Depends(get_db)):
     """Backup login method using username/password."""
-    import os
-    import hashlib
-    import json
-
     # Get backup credentials from environment variables for security
     backup_users_json = os.getenv("BACKUP_USERS", "")
 
@@ -240,6 +280,7 @@ async def backup_login(request: BackupLoginRequest, db: Session = Depends(get_db
             backup_users = {
                 backup_username: {
                     "password_hash": backup_password_hash,
+                    "password_digest": _decode_password_hash(backup_password_hash),
                     "is_admin": True,
                     "permissions": {"services": ["*"]}
                 }
@@ -248,7 +289,7 @@ async def backup_login(request: BackupLoginRequest, db: Session = Depends(get_db
             backup_users = {}
     else:
         try:
-            backup_users = json.loads(backup_users_json)
+            backup_users = _parse_backup_users(backup_users_json)
         except json.JSONDecodeError:
             raise HTTPException(
                 status_code=500,
@@ -272,12 +313,8 @@ async def backup_login(request: BackupLoginRequest, db: Session = Depends(get_db
 
     user_config = backup_users[request.username]
 
-    # Hash the provided password to compare with stored hash
-    provided_password_hash = hashlib.sha256(request.password.encode()).hexdigest()
-
-    # Secure comparison to prevent timing attacks
-    import hmac
-    if not hmac.compare_digest(provided_password_hash, user_config["password_hash"]):
+    # Hash the provided password and compare it with the pre-decoded stored hash
+    if not _verify(request.password, user_config["password_digest"]):
         # Log failed attempt for security monitoring
         import logging
         logger = logging.getLogger(__name__)
@@ -149,53 +149,21 @@ class LoggingAssertions:
     def assert_log_entry_structure(log_entry_json):
         """Assert that a log entry has the expected structure."""
         import json
+        from app.middleware.logging_middleware import LOG_SCHEMA, _decode
         
-        log_data = json.loads(log_entry_json)
-        
-        # Check required top-level fields
-        assert "type" in log_data
-        assert "request" in log_data
-        assert "response" in log_data
-        assert "timestamp" in log_data
-        
-        # Check request structure
-        request = log_data["request"]
-        assert "method" in request
-        assert "url" in request
-        assert "path" in request
-        
-        # Check response structure
-        response = log_data["response"]
-        assert "status_code" in response
-        assert "process_time" in response
-    
-    @staticmethod
-    def assert_sensitive_data_masked(log_entry_json, original_data):
-        """Assert that sensitive data is properly masked in log entry."""
-        import json
-        
-        log_data = json.loads(log_entry_json)
-        request_body = log_data.get("request", {}).get("body", {})
-        
-        if not isinstance(request_body, dict):
-            return  # Skip if body is not a dict
+        record = json.loads(log_entry_json)
         
-        sensitive_fields = ["password", "token", "secret", "key", "authorization"]
+        # Entries are flat arrays in LOG_SCHEMA order
+        assert isinstance(record, list)
+        assert len(record) == len(LOG_SCHEMA)
         
-        for field in sensitive_fields:
-            for key in request_body:
-                if isinstance(key, str) and field.lower() in key.lower():
-                    original_value = original_data.get(key, "")
-                    logged_value = request_body.get(key, "")
-                    
-                    if original_value and len(original_value) > 4:
-                        # Should be masked with *** prefix
-                        assert logged_value.startswith("***")
-                        # Should end with last 4 chars of original
-                        assert logged_value.endswith(original_value[-4:])
-                    elif original_value:
-                        # Short values should be completely masked
-                        assert logged_value == "***"
+        log_data = _decode(record)
+        assert log_data["type"] == "http_request"
+        assert log_data["method"]
+        assert log_data["path"]
+        assert log_data["status"] is not None
+        assert log_data["process_time"] is not None
+        assert log_data["ts"] is not None
     
     @staticmethod
     def assert_no_sensitive_data_leaked(log_entry_json, sensitive_values):
@@ -222,37 +190,20 @@ class TestDataGenerator:
     """Generate test data for logging tests."""
     
     @staticmethod
-    def generate_request_data(method="GET", path="/test", include_body=False):
-        """Generate mock request data."""
-        data = {
+    def generate_request_data(method="GET", path="/test"):
+        """Generate mock request data, as returned by _extract_request_data."""
+        return {
             "method": method,
-            "url": f"http://test.com{path}",
             "path": path,
-            "query_params": {},
-            "headers": {
-                "user-agent": "test-agent",
-                "host": "test.com"
-            },
             "client_ip": "127.0.0.1",
             "user_agent": "test-agent"
         }
-        
-        if include_body and method in ["POST", "PUT", "PATCH"]:
-            data["body"] = {
-                "username": "testuser",
-                "password": "testpassword123"
-            }
-        else:
-            data["body"] = None
-        
-        return data
     
     @staticmethod
     def generate_response_data(status_code=200, process_time=0.1):
-        """Generate mock response data."""
+        """Generate mock response data, as returned by _extract_response_data."""
         return {
             "status_code": status_code,
-            "headers": {"content-type": "application/json"},
             "process_time": process_time
         }
     
@@ -4,19 +4,12 @@ import time
 import os
 import tempfile
 from pathlib import Path
-from fastapi.testclient import TestClient
-from app.main import app
 
 
 @pytest.mark.e2e
 class TestLoggingEndToEnd:
     """End-to-end tests for the complete logging system."""
     
-    @pytest.fixture
-    def client(self):
-        """Create a test client."""
-        return TestClient(app)
-    
     @pytest.fixture(scope="class")
     def log_monitor(self):
         """Monitor log files during tests."""
@@ -134,10 +127,9 @@ class TestLoggingEndToEnd:
         
         # Run concurrent request batches
         with concurrent.futures.ThreadPoolExecutor(max_workers=10) as executor:
-            futures = [executor.submit(make_multiple_requests) for _ in range(5)]
             all_results = []
-            for future in concurrent.futures.as_completed(futures):
-                all_results.extend(future.result())
+            for results in executor.map(lambda _: make_multiple_requests(), range(5)):
+                all_results.extend(results)
         
         # Should handle 100 requests without major issues
         assert len(all_results) == 100
@@ -162,6 +154,7 @@ class TestLoggingEndToEnd:
         # 4. Change back to true
         # 5. Verify requests are logged again
     
+    @pytest.mark.serial
     def test_log_file_accessibility(self):
         """Test that log files are accessible and readable."""
         log_dir = Path("/app/logs")
@@ -170,7 +163,7 @@ class TestLoggingEndToEnd:
         # Note: This might need adjustment based on test setup
         if log_dir.exists():
             # Check that we can list log files
-            log_files = list(log_dir.glob("*.log"))
+            log_files = list(log_dir.glob("*.jsonl"))
             
             # Verify log files are readable
             for log_file in log_files:
@@ -270,10 +263,6 @@ class TestLoggingEndToEnd:
 class TestLoggingInProduction:
     """Tests that simulate production logging scenarios."""
     
-    @pytest.fixture
-    def client(self):
-        return TestClient(app)
-    
     def test_logging_with_real_oauth_flow(self, client):
         """Test logging with realistic OAuth flow simulation."""
         
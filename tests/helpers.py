@@ -0,0 +1,7 @@
+# Plain test helpers, imported by test modules and conftest fixtures
+
+
+def set_first(db, obj):
+    """Make db.query(...).filter(...).first() return obj."""
+    db.query.return_value.filter.return_value.first.return_value = obj
+    return obj
@@ -2,6 +2,24 @@
 import pytest
 from fastapi.testclient import TestClient
 from unittest.mock import patch
+from fastapi import HTTPException
+from fastapi.responses import RedirectResponse
+from app.main import app
+from app.routes.auth import auth_callback, get_oauth_service
+from app.models.user import User
+from app.config import settings
+
+
+class FakeOAuthService:
+    """Stand-in for OAuthService that returns a canned GitHub exchange result."""
+
+    def __init__(self, user_data=None):
+        self.user_data = user_data
+        self.codes = []
+
+    async def exchange_github_code(self, code):
+        self.codes.append(code)
+        return self.user_data
 
 
 class TestAuthEndpoints:
@@ -27,11 +45,11 @@ class TestAuthEndpoints:
         """Test unsupported provider returns 400."""
         response = test_client.get("/login/twitter")
 
-    @patch('app.services.oauth_service.OAuthService.exchange_github_code')
-    def test_github_callback_success(self, mock_exchange, test_client: TestClient, test_db):
+    @pytest.mark.asyncio
+    async def test_github_callback_success(self, test_db):
         """Test successful GitHub OAuth callback."""
-        # Mock successful OAuth exchange
-        mock_exchange.return_value = {
+        # Fake a successful OAuth exchange
+        fake_oauth = FakeOAuthService({
             "email": "test@example.com",
             "username": "testuser",
             "full_name": "Test User",
@@ -39,27 +57,62 @@ class TestAuthEndpoints:
             "provider": "github",
             "provider_id": "12345",
             "provider_data": {"login": "testuser"}
-        }
-
-        response = test_client.get("/callback/github?code=test_code&state=test_state", allow_redirects=False)
+        })
+
+        # Only pre-registered users can sign in via OAuth
+        if not test_db.query(User).filter(User.provider == "github", User.provider_id == "12345").first():
+            test_db.add(User(
+                email="test@example.com",
+                username="testuser",
+                provider="github",
+                provider_id="12345",
+                is_active=True,
+                permissions={"services": []}
+            ))
+            test_db.commit()
+
+        # Call the route handler directly instead of going through the ASGI stack
+        response = await auth_callback(
+            provider="github", code="test_code", state="test_state",
+            db=test_db, oauth_service=fake_oauth
+        )
+        assert isinstance(response, RedirectResponse)
         assert response.status_code == 307  # Redirect status
         location = response.headers.get("location")
-        assert location is not None
-        assert "http://localhost:3000/" in location
-        assert "access_token=" in location
-        assert "refresh_token=" in location
-        assert "token_type=bearer" in location
-
-    @patch('app.services.oauth_service.OAuthService.exchange_github_code')
-    def test_github_callback_oauth_error(self, mock_exchange, test_client: TestClient):
-        """Test GitHub OAuth callback with OAuth service error."""
-        mock_exchange.return_value = None
+        assert location == f"{settings.frontend_url}/signin?success=true"
+        assert fake_oauth.codes == ["test_code"]
 
-        response = test_client.get("/callback/github?code=test_code&state=test_state", allow_redirects=False)
+    @pytest.mark.asyncio
+    async def test_github_callback_oauth_error(self, test_db):
+        """Test GitHub OAuth callback with OAuth service error."""
+        response = await auth_callback(
+            provider="github", code="test_code", state="test_state",
+            db=test_db, oauth_service=FakeOAuthService(None)
+        )
         assert response.status_code == 307  # Redirect status
         location = response.headers.get("location")
-        assert location is not None
-        assert location == "http://localhost:3000/?error=oauth_failed"
+        assert location == f"{settings.frontend_url}/signin?error=oauth_failed"
+
+    @pytest.mark.asyncio
+    async def test_callback_unsupported_provider(self, test_db):
+        """Test OAuth callback with an unsupported provider raises 400."""
+        with pytest.raises(HTTPException) as exc:
+            await auth_callback(
+                provider="twitter", code="test_code", state="test_state",
+                db=test_db, oauth_service=FakeOAuthService()
+            )
+        assert exc.value.status_code == 400
+
+    def test_github_callback_uses_overridden_oauth_service(self, test_client: TestClient):
+        """Test the callback route resolves OAuthService through dependency overrides."""
+        fake_oauth = FakeOAuthService(None)
+        # Cleared by the test_client fixture on teardown
+        app.dependency_overrides[get_oauth_service] = lambda: fake_oauth
+
+        response = test_client.get("/callback/github?code=test_code&state=test_state", follow_redirects=False)
+        assert response.status_code == 307
+        assert "error=oauth_failed" in response.headers["location"]
+        assert fake_oauth.codes == ["test_code"]
 
     def test_callback_missing_parameters(self, test_client: TestClient):
         """Test OAuth callback with missing parameters."""
@@ -8,6 +8,45 @@ from app.routes.auth import backup_login, BackupLoginRequest
 from app.models.user import User
 from app.database import get_db
 
+# SHA-256 hashes of the backup user passwords used below
+TEST12345_HASH = '6fec2a9601d5b3581c94f2150fc07fa3d6e45808079428354b868e412b76e6bb'  # hash of 'test12345'
+OPERATOR12345_HASH = '866d68aeb057cfe0b155e4e32c1775bfba179d19ee6506b84728475bae3cf5e7'  # hash of 'operator12345'
+
+# BACKUP_USERS payloads, serialized once at import time
+_BACKUP_USERS_SINGLE = json.dumps({
+    'testuser': {
+        'password_hash': TEST12345_HASH,
+        'is_admin': False,
+        'permissions': {'services': ['read']}
+    }
+})
+_BACKUP_USERS_EXISTING = json.dumps({
+    'existinguser': {
+        'password_hash': TEST12345_HASH,
+        'is_admin': True,
+        'permissions': {'services': ['*']}
+    }
+})
+_BACKUP_USERS_PAIR = json.dumps({
+    'user1': {
+        'password_hash': TEST12345_HASH,
+        'is_admin': True,
+        'permissions': {'services': ['*']}
+    },
+    'user2': {
+        'password_hash': OPERATOR12345_HASH,
+        'is_admin': False,
+        'permissions': {'services': ['read', 'write']}
+    }
+})
+_BACKUP_USERS_UPDATE = json.dumps({
+    'updateuser': {
+        'password_hash': TEST12345_HASH,
+        'is_admin': False,  # Changed from True to False
+        'permissions': {'services': ['read']}  # Changed permissions
+    }
+})
+
 
 class TestBackupUserIntegration:
     """Integration tests for backup user functionality with database."""
@@ -15,15 +54,7 @@ class TestBackupUserIntegration:
     @pytest.mark.asyncio
     async def test_backup_login_creates_user_in_database(self, test_db: Session):
         """Test that backup login creates a user in the database."""
-        with patch.dict(os.environ, {
-            'BACKUP_USERS': json.dumps({
-            'testuser': {
-                'password_hash': '6fec2a9601d5b3581c94f2150fc07fa3d6e45808079428354b868e412b76e6bb',  # hash of 'test12345'
-                    'is_admin': False,
-                    'permissions': {'services': ['read']}
-                }
-            })
-        }):
+        with patch.dict(os.environ, {'BACKUP_USERS': _BACKUP_USERS_SINGLE}):
             # Ensure user doesn't exist
             existing_user = test_db.query(User).filter(
                 User.username == "backup_testuser",
@@ -61,15 +92,7 @@ class TestBackupUserIntegration:
     @pytest.mark.asyncio
     async def test_backup_login_existing_user_no_duplicate(self, test_db: Session):
         """Test that backup login doesn't create duplicate users."""
-        with patch.dict(os.environ, {
-            'BACKUP_USERS': json.dumps({
-                'existinguser': {
-                    'password_hash': '6fec2a9601d5b3581c94f2150fc07fa3d6e45808079428354b868e412b76e6bb',  # hash of 'test12345'
-                    'is_admin': True,
-                    'permissions': {'services': ['*']}
-                }
-            })
-        }):
+        with patch.dict(os.environ, {'BACKUP_USERS': _BACKUP_USERS_EXISTING}):
             # Create user first
             first_request = BackupLoginRequest(username="existinguser", password="test12345")
             first_response = await backup_login(first_request, test_db)
@@ -98,20 +121,7 @@ class TestBackupUserIntegration:
     @pytest.mark.asyncio
     async def test_backup_login_different_users_create_separate_records(self, test_db: Session):
         """Test that different backup users create separate database records."""
-        with patch.dict(os.environ, {
-            'BACKUP_USERS': json.dumps({
-                'user1': {
-                    'password_hash': '6fec2a9601d5b3581c94f2150fc07fa3d6e45808079428354b868e412b76e6bb',  # hash of 'test12345'
-                    'is_admin': True,
-                    'permissions': {'services': ['*']}
-                },
-                'user2': {
-                    'password_hash': '866d68aeb057cfe0b155e4e32c1775bfba179d19ee6506b84728475bae3cf5e7',  # hash of 'operator12345'
-                    'is_admin': False,
-                    'permissions': {'services': ['read', 'write']}
-                }
-            })
-        }):
+        with patch.dict(os.environ, {'BACKUP_USERS': _BACKUP_USERS_PAIR}):
             # Clean up any existing test users
             for username in ['backup_user1', 'backup_user2']:
                 existing = test_db.query(User).filter(
@@ -152,15 +162,7 @@ class TestBackupUserIntegration:
     @pytest.mark.asyncio
     async def test_backup_login_updates_existing_user_permissions(self, test_db: Session):
         """Test that backup login can update existing user permissions if config changes."""
-        with patch.dict(os.environ, {
-            'BACKUP_USERS': json.dumps({
-                'updateuser': {
-                    'password_hash': '6fec2a9601d5b3581c94f2150fc07fa3d6e45808079428354b868e412b76e6bb',  # hash of 'test12345'
-                    'is_admin': False,  # Changed from True to False
-                    'permissions': {'services': ['read']}  # Changed permissions
-                }
-            })
-        }):
+        with patch.dict(os.environ, {'BACKUP_USERS': _BACKUP_USERS_UPDATE}):
             # Create user with initial permissions
             initial_user = User(
                 email="backup_updateuser@fastapi.local",
@@ -1,34 +1,34 @@
 # Basic health check test
+import logging
 import pytest
-from unittest.mock import Mock, patch
-from fastapi.testclient import TestClient
-from app.main import lifespan
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+from app.main import lifespan, health_check, root
 
 class TestHealthCheck:
-    def test_health_endpoint(self, test_client: TestClient):
+    # Handlers are called directly; the ASGI round-trip is covered in test_smoke.py
+    @pytest.mark.asyncio
+    async def test_health_endpoint(self):
         """Test that the health endpoint returns healthy status."""
-        response = test_client.get("/health")
-        assert response.status_code == 200
-        assert response.json() == {"status": "healthy"}
+        assert await health_check() == {"status": "healthy"}
 
-    def test_root_endpoint(self, test_client: TestClient):
+    @pytest.mark.asyncio
+    async def test_root_endpoint(self):
         """Test that the root endpoint returns the expected message."""
-        response = test_client.get("/")
-        assert response.status_code == 200
-        data = response.json()
+        data = await root()
         assert "message" in data
         assert "FastAPI Authentication Service" in data["message"]
 
     @pytest.mark.asyncio
     @patch('app.main.Base')
     @patch('app.main.engine')
-    @patch('app.main.logger')
+    @patch('app.main.logger', spec=logging.Logger)
     async def test_lifespan_startup_success(self, mock_logger, mock_engine, mock_base):
         """Test successful application startup in lifespan handler."""
         from fastapi import FastAPI
         
         # Mock the database operations
-        mock_metadata = Mock()
+        mock_metadata = SimpleNamespace(create_all=MagicMock())
         mock_base.metadata = mock_metadata
         
         app = FastAPI()
@@ -42,14 +42,15 @@ class TestHealthCheck:
     @pytest.mark.asyncio
     @patch('app.main.Base')
     @patch('app.main.engine')
-    @patch('app.main.logger')
+    @patch('app.main.logger', spec=logging.Logger)
     async def test_lifespan_startup_database_error(self, mock_logger, mock_engine, mock_base):
         """Test database error handling in lifespan handler."""
         from fastapi import FastAPI
         
         # Mock the database operations to raise an exception
-        mock_metadata = Mock()
-        mock_metadata.create_all.side_effect = Exception("Database connection failed")
+        mock_metadata = SimpleNamespace(
+            create_all=MagicMock(side_effect=Exception("Database connection failed"))
+        )
         mock_base.metadata = mock_metadata
         
         app = FastAPI()
@@ -3,9 +3,13 @@ import json
 import tempfile
 import os
 import asyncio
+import httpx
+import timeit
 from pathlib import Path
+from fastapi import FastAPI
 from fastapi.testclient import TestClient
 from app.main import app
+from app.middleware.logging_middleware import RequestLoggingMiddleware
 from app.config import settings
 import logging
 
@@ -14,11 +18,6 @@ import logging
 class TestLoggingSystemIntegration:
     """Integration tests for the complete logging system."""
     
-    @pytest.fixture
-    def client(self):
-        """Create a test client with the actual app."""
-        return TestClient(app)
-    
     @pytest.fixture
     def temp_log_dir(self):
         """Create a temporary directory for log files."""
@@ -79,70 +78,58 @@ class TestLoggingSystemIntegration:
         # Should return CORS headers or 405
         assert response.status_code in [200, 405]
     
-    def test_concurrent_requests_logging(self, client):
+    @pytest.mark.asyncio
+    async def test_concurrent_requests_logging(self):
         """Test that concurrent requests don't interfere with logging."""
-        import concurrent.futures
-        import threading
-        
-        def make_request():
-            response = client.get("/login/github")
+        async def make_request(ac):
+            response = await ac.get("/login/github")
             return response.status_code
         
-        # Make multiple concurrent requests
-        with concurrent.futures.ThreadPoolExecutor(max_workers=5) as executor:
-            futures = [executor.submit(make_request) for _ in range(10)]
-            results = [future.result() for future in concurrent.futures.as_completed(futures)]
+        # Make multiple concurrent requests on a single event loop
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as ac:
+            results = await asyncio.gather(*[make_request(ac) for _ in range(10)])
         
         # All requests should complete without error
         assert len(results) == 10
         assert all(status in [200, 302, 422] for status in results)
     
-    @pytest.mark.asyncio
-    async def test_async_logging_performance(self, client):
+    def test_async_logging_performance(self, client, benchmark):
         """Test that logging doesn't significantly impact performance."""
-        import time
-        
-        # Measure time for requests with logging
-        start_time = time.time()
-        for _ in range(10):
-            response = client.get("/login/github")
-            assert response.status_code in [200, 302, 422]
-        end_time = time.time()
+        response = benchmark.pedantic(client.get, args=("/login/github",), rounds=10, iterations=1)
+        assert response.status_code in [200, 302, 422]
         
-        # Should complete reasonably quickly (adjust threshold as needed)
-        total_time = end_time - start_time
-        assert total_time < 5.0  # 10 requests should complete in under 5 seconds
+        # Should complete reasonably quickly (adjust threshold as needed);
+        # benchmarking is switched off under xdist, so there may be no stats
+        if not benchmark.disabled:
+            assert benchmark.stats.stats.mean < 0.5  # under half a second per request
 
 
-@pytest.mark.integration  
+@pytest.mark.integration
+@pytest.mark.serial
 class TestLoggingFileOperations:
     """Test actual file logging operations."""
     
+    @pytest.mark.skip(reason="not implemented")
     def test_log_file_creation(self):
         """Test that log files are created in the correct location."""
         log_dir = Path("/app/logs")
         
         # Note: In a real test environment, we might need to mock this
         # or use a test-specific log directory
-        expected_files = [
-            "app.log",
-            "requests.log", 
-            "oauth.log",
-            "auth.log",
-            "database.log",
-            "error.log"
-        ]
+        expected_files = ["app.jsonl"]
         
         # This test assumes the logging system has been initialized
         # In practice, you might need to trigger log creation first
         pass
     
+    @pytest.mark.skip(reason="not implemented")
     def test_log_rotation(self):
         """Test that log rotation works correctly."""
         # This would require generating enough log data to trigger rotation
         # or mocking the file size check
         pass
     
+    @pytest.mark.skip(reason="not implemented")
     def test_log_file_permissions(self):
         """Test that log files have correct permissions."""
         # This test would check file permissions on created log files
@@ -153,11 +140,13 @@ class TestLoggingFileOperations:
 class TestLoggingConfiguration:
     """Test logging configuration in different scenarios."""
     
+    @pytest.mark.skip(reason="not implemented")
     def test_logging_disabled_configuration(self):
         """Test behavior when logging is disabled."""
         # This would require starting the app with ENABLE_REQUEST_LOGGING=false
         pass
     
+    @pytest.mark.skip(reason="not implemented")
     def test_different_log_levels(self):
         """Test behavior with different log levels."""
         # Test with various LOG_LEVEL settings
@@ -184,17 +173,14 @@ class TestLoggingConfiguration:
 class TestSpecificEndpointLogging:
     """Test logging for specific application endpoints."""
     
-    @pytest.fixture
-    def client(self):
-        return TestClient(app)
-    
     def test_health_endpoint_not_logged(self, client):
         """Verify that health endpoint is not logged."""
         response = client.get("/health")
         assert response.status_code == 200
         # In a real test, you'd verify the log files don't contain this request
     
-    def test_authentication_endpoints_logged(self, client):
+    @pytest.mark.asyncio
+    async def test_authentication_endpoints_logged(self):
         """Test that authentication endpoints are properly logged."""
         endpoints = [
             "/login/github",
@@ -203,8 +189,10 @@ class TestSpecificEndpointLogging:
             "/refresh"
         ]
         
-        for endpoint in endpoints:
-            response = client.get(endpoint)
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as ac:
+            responses = await asyncio.gather(*[ac.get(endpoint) for endpoint in endpoints])
+        
+        for response in responses:
             # These might return various status codes depending on configuration
             assert response.status_code in [200, 302, 401, 403, 405, 422, 500, 503]
     
@@ -236,10 +224,6 @@ class TestSpecificEndpointLogging:
 class TestLoggingErrorScenarios:
     """Test logging behavior in error scenarios."""
     
-    @pytest.fixture
-    def client(self):
-        return TestClient(app)
-    
     def test_malformed_request_logging(self, client):
         """Test logging of malformed requests."""
         # Send invalid JSON
@@ -285,46 +269,53 @@ class TestLoggingErrorScenarios:
 class TestLoggingPerformance:
     """Performance tests for the logging system."""
     
-    @pytest.fixture
-    def client(self):
-        return TestClient(app)
-    
-    def test_logging_overhead(self, client):
-        """Test that logging doesn't add significant overhead."""
-        import time
+    @pytest.fixture(scope="class")
+    def logging_clients(self):
+        """Provide clients for identical apps with request logging on and off."""
+        def make_client(enabled):
+            test_app = FastAPI()
+            test_app.add_middleware(RequestLoggingMiddleware, enable_request_logging=enabled)
+            
+            @test_app.get("/ping")
+            async def ping():
+                return {"status": "ok"}
+            
+            return TestClient(test_app)
         
-        # Measure baseline performance (health check - not logged)
-        start = time.time()
-        for _ in range(100):
-            client.get("/health")
-        baseline_time = time.time() - start
+        return make_client(True), make_client(False)
+    
+    def test_logging_overhead(self, benchmark, logging_clients):
+        """Test that request logging doesn't add significant overhead.
         
-        # Measure performance with logging (regular endpoint)
-        start = time.time()
-        for _ in range(100):
-            client.get("/login/github")
-        logged_time = time.time() - start
+        The logged request is benchmarked (group "logging-overhead", trackable
+        with --benchmark-compare) against the same request with logging off.
+        """
+        logged, unlogged = logging_clients
+        benchmark.group = "logging-overhead"
+        response = benchmark.pedantic(logged.get, args=("/ping",), rounds=20, iterations=5)
+        assert response.status_code == 200
         
-        # Logging should not add more than 50% overhead
-        # (adjust threshold based on requirements)
-        overhead_ratio = logged_time / baseline_time if baseline_time > 0 else 1
-        assert overhead_ratio < 2.0
+        # Logging should not double the request time (adjust threshold as needed);
+        # with --benchmark-disable (or under xdist) there are no stats to compare
+        if not benchmark.disabled:
+            baseline = min(timeit.repeat(lambda: unlogged.get("/ping"), number=5, repeat=20)) / 5
+            overhead_ratio = benchmark.stats.stats.min / baseline
+            assert overhead_ratio < 2.0
     
-    def test_concurrent_logging_performance(self, client):
+    @pytest.mark.asyncio
+    async def test_concurrent_logging_performance(self):
         """Test logging performance under concurrent load."""
-        import concurrent.futures
         import time
         
-        def make_requests():
-            start = time.time()
+        async def make_requests(ac):
+            start = time.perf_counter()
             for _ in range(10):
-                client.get("/login/github")
-            return time.time() - start
+                await ac.get("/login/github")
+            return time.perf_counter() - start
         
         # Run concurrent request batches
-        with concurrent.futures.ThreadPoolExecutor(max_workers=5) as executor:
-            futures = [executor.submit(make_requests) for _ in range(5)]
-            times = [future.result() for future in concurrent.futures.as_completed(futures)]
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as ac:
+            times = await asyncio.gather(*[make_requests(ac) for _ in range(5)])
         
         # All batches should complete in reasonable time
         max_time = max(times)
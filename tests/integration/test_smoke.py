@@ -0,0 +1,12 @@
+# End-to-end smoke test through the full ASGI stack
+from fastapi.testclient import TestClient
+from app.main import app
+
+
+class TestSmoke:
+    def test_health_endpoint_over_http(self):
+        """Test that /health responds through routing, middleware and JSON encoding."""
+        client = TestClient(app)
+        response = client.get("/health")
+        assert response.status_code == 200
+        assert response.json() == {"status": "healthy"}
@@ -1,18 +1,22 @@
 # Unit tests for authentication middleware
 import pytest
+from collections import namedtuple
 from unittest.mock import Mock, patch
 from fastapi import HTTPException
 from app.models.user import User
 from app.middleware.auth_middleware import get_current_user, require_admin
+from tests.helpers import set_first
+
+# get_current_user only reads .credentials from the bearer credentials
+Creds = namedtuple("Creds", ["credentials"])
 
 class TestAuthMiddleware:
     @pytest.mark.asyncio
     @patch('app.middleware.auth_middleware.token_service')
     @patch('app.middleware.auth_middleware.get_db')
-    async def test_get_current_user_valid_token(self, mock_get_db, mock_token_service):
+    async def test_get_current_user_valid_token(self, mock_get_db, mock_token_service, mock_db):
         """Test get_current_user with valid token."""
         # Mock database session
-        mock_db = Mock()
         mock_get_db.return_value = mock_db
         
         # Mock token service
@@ -26,11 +30,10 @@ class TestAuthMiddleware:
         mock_user = Mock()
         mock_user.id = 123
         mock_user.is_active = True
-        mock_db.query.return_value.filter.return_value.first.return_value = mock_user
+        set_first(mock_db, mock_user)
         
-        # Mock credentials
-        mock_credentials = Mock()
-        mock_credentials.credentials = "valid_token"
+        # Credentials
+        mock_credentials = Creds("valid_token")
         
         result = await get_current_user(mock_credentials, mock_db)
         
@@ -40,16 +43,14 @@ class TestAuthMiddleware:
     @pytest.mark.asyncio
     @patch('app.middleware.auth_middleware.token_service')
     @patch('app.middleware.auth_middleware.get_db')
-    async def test_get_current_user_invalid_token(self, mock_get_db, mock_token_service):
+    async def test_get_current_user_invalid_token(self, mock_get_db, mock_token_service, mock_db):
         """Test get_current_user with invalid token."""
-        mock_db = Mock()
         mock_get_db.return_value = mock_db
         
         # Mock token service to return None (invalid token)
         mock_token_service.verify_access_token.return_value = None
         
-        mock_credentials = Mock()
-        mock_credentials.credentials = "invalid_token"
+        mock_credentials = Creds("invalid_token")
         
         with pytest.raises(HTTPException) as exc_info:
             await get_current_user(mock_credentials, mock_db)
@@ -60,9 +61,8 @@ class TestAuthMiddleware:
     @pytest.mark.asyncio
     @patch('app.middleware.auth_middleware.token_service')
     @patch('app.middleware.auth_middleware.get_db')
-    async def test_get_current_user_missing_user_id(self, mock_get_db, mock_token_service):
+    async def test_get_current_user_missing_user_id(self, mock_get_db, mock_token_service, mock_db):
         """Test get_current_user with token missing user ID."""
-        mock_db = Mock()
         mock_get_db.return_value = mock_db
         
         # Mock token service with payload missing 'sub'
@@ -70,8 +70,7 @@ class TestAuthMiddleware:
             "email": "test@example.com"
         }
         
-        mock_credentials = Mock()
-        mock_credentials.credentials = "token_without_sub"
+        mock_credentials = Creds("token_without_sub")
         
         with pytest.raises(HTTPException) as exc_info:
             await get_current_user(mock_credentials, mock_db)
@@ -82,20 +81,15 @@ class TestAuthMiddleware:
     @pytest.mark.asyncio
     @patch('app.middleware.auth_middleware.token_service')
     @patch('app.middleware.auth_middleware.get_db')
-    async def test_get_current_user_user_not_found(self, mock_get_db, mock_token_service):
+    async def test_get_current_user_user_not_found(self, mock_get_db, mock_token_service, mock_db):
         """Test get_current_user when user is not found."""
-        mock_db = Mock()
         mock_get_db.return_value = mock_db
         
         mock_token_service.verify_access_token.return_value = {
             "sub": "123"
         }
         
-        # Mock user not found
-        mock_db.query.return_value.filter.return_value.first.return_value = None
-        
-        mock_credentials = Mock()
-        mock_credentials.credentials = "valid_token"
+        mock_credentials = Creds("valid_token")
         
         with pytest.raises(HTTPException) as exc_info:
             await get_current_user(mock_credentials, mock_db)
@@ -106,9 +100,8 @@ class TestAuthMiddleware:
     @pytest.mark.asyncio
     @patch('app.middleware.auth_middleware.token_service')
     @patch('app.middleware.auth_middleware.get_db')
-    async def test_get_current_user_inactive_user(self, mock_get_db, mock_token_service):
+    async def test_get_current_user_inactive_user(self, mock_get_db, mock_token_service, mock_db):
         """Test get_current_user with inactive user."""
-        mock_db = Mock()
         mock_get_db.return_value = mock_db
         
         mock_token_service.verify_access_token.return_value = {
@@ -118,10 +111,9 @@ class TestAuthMiddleware:
         # Mock inactive user
         mock_user = Mock()
         mock_user.is_active = False
-        mock_db.query.return_value.filter.return_value.first.return_value = mock_user
+        set_first(mock_db, mock_user)
         
-        mock_credentials = Mock()
-        mock_credentials.credentials = "valid_token"
+        mock_credentials = Creds("valid_token")
         
         with pytest.raises(HTTPException) as exc_info:
             await get_current_user(mock_credentials, mock_db)
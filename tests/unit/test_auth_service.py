@@ -1,18 +1,14 @@
 # Unit tests for auth service
 import pytest
 from unittest.mock import Mock, patch
-from sqlalchemy.orm import Session
 from app.services.auth_service import AuthService
 from app.models.user import User
+from tests.helpers import set_first
 
 class TestAuthService:
-    def test_create_or_update_user_new_user(self):
+    def test_create_or_update_user_new_user(self, mock_db):
         """Test creating a new user."""
         service = AuthService()
-        mock_db = Mock(spec=Session)
-
-        # Mock that user doesn't exist
-        mock_db.query.return_value.filter.return_value.first.return_value = None
 
         oauth_data = {
             "email": "test@example.com",
@@ -36,10 +32,9 @@ class TestAuthService:
         mock_db.add.assert_called_once()
         mock_db.commit.assert_called_once()
 
-    def test_create_or_update_user_existing_user(self):
+    def test_create_or_update_user_existing_user(self, mock_db):
         """Test updating an existing user."""
         service = AuthService()
-        mock_db = Mock(spec=Session)
 
         existing_user = User(
             email="old@example.com",
@@ -49,7 +44,7 @@ class TestAuthService:
         )
 
         # Mock that user exists
-        mock_db.query.return_value.filter.return_value.first.return_value = existing_user
+        set_first(mock_db, existing_user)
 
         oauth_data = {
             "email": "new@example.com",
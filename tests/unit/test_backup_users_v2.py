@@ -1,113 +1,122 @@
 """Revised unit tests for backup_login endpoint."""
-import os
 import json
 import pytest
-from unittest.mock import Mock, patch
-from sqlalchemy.orm import Session
+from unittest.mock import patch
 from fastapi import HTTPException
 
 from app.routes.auth import backup_login, BackupLoginRequest
 from app.models.user import User
+from tests.helpers import set_first
+
+@pytest.fixture
+def backup_users(monkeypatch):
+    """Set BACKUP_USERS for one test; returns the config dict it was given."""
+    def _set(cfg):
+        monkeypatch.setenv('BACKUP_USERS', json.dumps(cfg))
+        return cfg
+    return _set
 
 @ pytest.mark.asyncio
-async def test_backup_login_success_create_user():
+async def test_backup_login_success_create_user(backup_users, mock_db):
     """Test successful backup login creating a new user."""
-    mock_db = Mock(spec=Session)
-    # User does not exist
-    mock_db.query.return_value.filter.return_value.first.return_value = None
-    mock_db.add.return_value = None
-    mock_db.commit.return_value = None
-    mock_db.refresh.return_value = None
-
-    users_config = {
+    backup_users({
         'admin': {
             'password_hash': '6fec2a9601d5b3581c94f2150fc07fa3d6e45808079428354b868e412b76e6bb',
             'is_admin': True,
             'permissions': {'services': ['*']}
         }
-    }
-    with patch.dict(os.environ, {'BACKUP_USERS': json.dumps(users_config)}):
-        with patch('app.routes.auth.auth_service') as mock_auth:
-            mock_auth.create_tokens.return_value = {
-                'access_token': 'token',
-                'refresh_token': 'refresh',
-                'token_type': 'bearer',
-                'expires_in': 3600
-            }
-            request = BackupLoginRequest(username='admin', password='test12345')
-            response = await backup_login(request, mock_db)
+    })
+    with patch('app.routes.auth.auth_service') as mock_auth:
+        mock_auth.create_tokens.return_value = {
+            'access_token': 'token',
+            'refresh_token': 'refresh',
+            'token_type': 'bearer',
+            'expires_in': 3600
+        }
+        request = BackupLoginRequest(username='admin', password='test12345')
+        response = await backup_login(request, mock_db)
 
-            assert response['access_token'] == 'token'
-            assert response['user']['username'] == 'backup_admin'
-            mock_db.add.assert_called_once()
+        assert response['access_token'] == 'token'
+        assert response['user']['username'] == 'backup_admin'
+        mock_db.add.assert_called_once()
 
 @ pytest.mark.asyncio
-async def test_backup_login_existing_user_no_create():
+async def test_backup_login_existing_user_no_create(backup_users, mock_db):
     """Test backup login when user exists in database."""
     existing = User(id=1, email='backup@x.com', username='backup_admin',
                     full_name='Backup Admin', is_admin=True,
                     permissions={'services': ['*']})
-    mock_db = Mock(spec=Session)
-    mock_db.query.return_value.filter.return_value.first.return_value = existing
+    set_first(mock_db, existing)
 
-    users_config = {
+    backup_users({
         'admin': {
             'password_hash': '6fec2a9601d5b3581c94f2150fc07fa3d6e45808079428354b868e412b76e6bb',
             'is_admin': True,
             'permissions': {'services': ['*']}
         }
-    }
-    with patch.dict(os.environ, {'BACKUP_USERS': json.dumps(users_config)}):
-        with patch('app.routes.auth.auth_service') as mock_auth:
-            mock_auth.create_tokens.return_value = {
-                'access_token': 'token',
-                'refresh_token': 'refresh',
-                'token_type': 'bearer',
-                'expires_in': 3600
-            }
-            request = BackupLoginRequest(username='admin', password='test12345')
-            response = await backup_login(request, mock_db)
+    })
+    with patch('app.routes.auth.auth_service') as mock_auth:
+        mock_auth.create_tokens.return_value = {
+            'access_token': 'token',
+            'refresh_token': 'refresh',
+            'token_type': 'bearer',
+            'expires_in': 3600
+        }
+        request = BackupLoginRequest(username='admin', password='test12345')
+        response = await backup_login(request, mock_db)
 
-            mock_db.add.assert_not_called()
-            assert response['user']['username'] == 'backup_admin'
+        mock_db.add.assert_not_called()
+        assert response['user']['username'] == 'backup_admin'
 
 @ pytest.mark.asyncio
-async def test_backup_login_wrong_password():
-    """Test backup login with incorrect password."""
-    mock_db = Mock(spec=Session)
-    users_config = {'admin': {'password_hash': 'wronghash', 'is_admin': True, 'permissions': {}}}
-    with patch.dict(os.environ, {'BACKUP_USERS': json.dumps(users_config)}):
-        request = BackupLoginRequest(username='admin', password='test12345')
-        with pytest.raises(HTTPException) as exc:
-            await backup_login(request, mock_db)
-        assert exc.value.status_code == 401
+@ pytest.mark.parametrize("env,username,expected_status", [
+    ({'admin': {'password_hash': 'wronghash', 'is_admin': True, 'permissions': {}}}, 'admin', 401),
+    ({'admin': {'password_hash': 'hash', 'is_admin': True, 'permissions': {}}}, 'unknown', 401),
+    (None, 'admin', 503),
+    ('not-json', 'admin', 500),
+], ids=['wrong_password', 'missing_user', 'no_configuration', 'invalid_json'])
+async def test_backup_login_failure(env, username, expected_status, monkeypatch, backup_users, mock_db):
+    """Test backup login rejects bad credentials and broken configuration."""
+    if isinstance(env, dict):
+        backup_users(env)
+    elif env is None:
+        monkeypatch.delenv('BACKUP_USERS', raising=False)
+    else:
+        monkeypatch.setenv('BACKUP_USERS', env)
+    request = BackupLoginRequest(username=username, password='test12345')
+    with pytest.raises(HTTPException) as exc:
+        await backup_login(request, mock_db)
+    assert exc.value.status_code == expected_status
 
 @ pytest.mark.asyncio
-async def test_backup_login_missing_user():
-    """Test backup login with missing username."""
-    mock_db = Mock(spec=Session)
-    users_config = {'admin': {'password_hash': 'hash', 'is_admin': True, 'permissions': {}}}
-    with patch.dict(os.environ, {'BACKUP_USERS': json.dumps(users_config)}):
-        request = BackupLoginRequest(username='unknown', password='test12345')
+async def test_backup_login_picks_up_changed_config(backup_users, mock_db):
+    """Test that a changed BACKUP_USERS value replaces the cached one."""
+    backup_users({'admin': {'password_hash': '6fec2a9601d5b3581c94f2150fc07fa3d6e45808079428354b868e412b76e6bb'}})
+    with patch('app.routes.auth.auth_service'):
+        await backup_login(BackupLoginRequest(username='admin', password='test12345'), mock_db)
+
+        # Rotate the password
+        backup_users({'admin': {'password_hash': '8bf729f5f3e2ba07cb421f6046e008ef4958665133b14fded2c7271c4664525f'}})
         with pytest.raises(HTTPException) as exc:
-            await backup_login(request, mock_db)
+            await backup_login(BackupLoginRequest(username='admin', password='test12345'), mock_db)
         assert exc.value.status_code == 401
 
+        response = await backup_login(BackupLoginRequest(username='admin', password='newpass123'), mock_db)
+        assert response['user']['username'] == 'backup_admin'
+
 @ pytest.mark.asyncio
-async def test_backup_login_no_configuration():
-    """Test backup login with no configuration."""
-    mock_db = Mock(spec=Session)
+async def test_backup_login_does_not_share_cached_config(backup_users, mock_db):
+    """Test that mutating returned permissions does not leak into later logins."""
+    backup_users({
+        'admin': {
+            'password_hash': '6fec2a9601d5b3581c94f2150fc07fa3d6e45808079428354b868e412b76e6bb',
+            'permissions': {'services': ['*']}
+        }
+    })
     request = BackupLoginRequest(username='admin', password='test12345')
-    with pytest.raises(HTTPException) as exc:
-        await backup_login(request, mock_db)
-    assert exc.value.status_code == 503
+    with patch('app.routes.auth.auth_service'):
+        first = await backup_login(request, mock_db)
+        first['user']['permissions']['services'].append('injected')
 
-@ pytest.mark.asyncio
-async def test_backup_login_invalid_json():
-    """Test backup login with invalid JSON config."""
-    mock_db = Mock(spec=Session)
-    with patch.dict(os.environ, {'BACKUP_USERS': 'not-json'}):
-        request = BackupLoginRequest(username='admin', password='test12345')
-        with pytest.raises(HTTPException) as exc:
-            await backup_login(request, mock_db)
-        assert exc.value.status_code == 500
+        second = await backup_login(request, mock_db)
+    assert second['user']['permissions'] == {'services': ['*']}
@@ -0,0 +1,172 @@
+# Unit tests for logging configuration
+import logging
+import logging.handlers
+import orjson
+import pytest
+import queue
+import time
+from app import logging_config
+from app.logging_config import (
+    BufferedFileHandler, JsonLinesFormatter, TimedFlushQueueListener,
+    queued_handler, setup_logging, start_log_listeners, stop_log_listeners
+)
+
+
+def _record(msg, level=logging.INFO):
+    return logging.LogRecord("test", level, __file__, 1, msg, None, None)
+
+
+def _wait_for(path, text, timeout=2.0):
+    """Poll path until it contains text or timeout seconds pass."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if path.exists() and text in path.read_text():
+            return True
+        time.sleep(0.02)
+    return False
+
+
+class TestBufferedFileHandler:
+    def test_warning_flushes_immediately(self, tmp_path):
+        """Test that WARNING records (failed logins) are not held in the buffer."""
+        log_file = tmp_path / "app.log"
+        target = logging.FileHandler(log_file)
+        handler = BufferedFileHandler(target, capacity=100, flush_interval=60)
+
+        handler.handle(_record("buffered"))
+        assert log_file.read_text() == ""
+
+        handler.handle(_record("Failed backup login attempt", logging.WARNING))
+        assert "buffered" in log_file.read_text()
+        assert "Failed backup login attempt" in log_file.read_text()
+        handler.close()
+
+
+class TestTimedFlushQueueListener:
+    def test_idle_buffer_is_flushed(self, tmp_path):
+        """Test that a lone record reaches disk without further logging."""
+        log_file = tmp_path / "app.log"
+        target = logging.FileHandler(log_file)
+        handler = BufferedFileHandler(target, capacity=100, flush_interval=0.1)
+        log_queue = queue.Queue()
+        listener = TimedFlushQueueListener(log_queue, handler, flush_interval=0.1)
+        listener.start()
+        try:
+            logging.handlers.QueueHandler(log_queue).handle(_record("lone record"))
+            assert _wait_for(log_file, "lone record")
+        finally:
+            listener.stop()
+            handler.close()
+
+
+@pytest.fixture
+def queued_logger(tmp_path, monkeypatch):
+    """Provide a logger writing JSON lines to tmp_path/app.jsonl through queued_handler."""
+    # Keep this test's listener out of the application's listener list
+    monkeypatch.setattr(logging_config, "_queue_listeners", [])
+    log_file = tmp_path / "app.jsonl"
+    file_handler = logging.FileHandler(log_file, encoding="utf-8")
+    file_handler.setFormatter(JsonLinesFormatter())
+
+    logger = logging.getLogger(f"test.logging_config.{tmp_path.name}")
+    logger.propagate = False
+    logger.setLevel(logging.INFO)
+    handler = queued_handler(file_handler)
+    logger.addHandler(handler)
+
+    yield logger, log_file
+
+    stop_log_listeners()
+    logger.removeHandler(handler)
+    file_handler.close()
+
+
+def _read_lines(log_file):
+    return [orjson.loads(line) for line in log_file.read_text().splitlines()]
+
+
+class TestJsonLinesFormatter:
+    def test_info_record(self):
+        """Test the fields of a below-ERROR record."""
+        entry = orjson.loads(JsonLinesFormatter().format(_record("hello %s")))
+
+        assert entry["logger"] == "test"
+        assert entry["level"] == "INFO"
+        assert entry["message"] == "hello %s"
+        assert "timestamp" in entry
+        assert "location" not in entry
+
+    def test_error_record_has_location(self):
+        """Test that ERROR records carry the source location."""
+        entry = orjson.loads(JsonLinesFormatter().format(_record("boom", logging.ERROR)))
+
+        assert entry["level"] == "ERROR"
+        assert entry["location"].endswith(":1")
+
+
+class TestQueueListeners:
+    def test_records_written_as_json_lines(self, queued_logger):
+        """Test that queued records land in the file as one JSON object per line."""
+        logger, log_file = queued_logger
+        logger.info("first")
+        logger.warning("second %d", 2)
+        stop_log_listeners()
+
+        lines = _read_lines(log_file)
+        assert [(l["level"], l["message"]) for l in lines] == [("INFO", "first"), ("WARNING", "second 2")]
+
+    def test_exception_traceback_in_message(self, queued_logger):
+        """Test that tracebacks survive the queue inside the message field."""
+        logger, log_file = queued_logger
+        try:
+            raise ValueError("bad value")
+        except ValueError:
+            logger.exception("failed")
+        stop_log_listeners()
+
+        (entry,) = _read_lines(log_file)
+        assert entry["message"].startswith("failed")
+        assert "ValueError: bad value" in entry["message"]
+
+    def test_stop_and_restart(self, queued_logger):
+        """Test that stopping flushes, is idempotent, and listeners can be restarted."""
+        logger, log_file = queued_logger
+        (listener,) = logging_config._queue_listeners
+        assert listener.running
+
+        logger.info("before stop")
+        stop_log_listeners()
+        stop_log_listeners()
+        assert not listener.running
+        assert [l["message"] for l in _read_lines(log_file)] == ["before stop"]
+
+        start_log_listeners()
+        assert listener.running
+        logger.info("after restart")
+        stop_log_listeners()
+        assert [l["message"] for l in _read_lines(log_file)] == ["before stop", "after restart"]
+
+
+class TestSetupLogging:
+    def test_repeat_call_replaces_previous_listener(self, monkeypatch):
+        """Test that setup_logging stops and closes the previous call's listener."""
+        monkeypatch.setattr(logging_config, "_queue_listeners", [])
+        root_logger = logging.getLogger()
+        saved_handlers, saved_level = root_logger.handlers[:], root_logger.level
+        try:
+            setup_logging()
+            (first,) = logging_config._queue_listeners
+            setup_logging()
+            (second,) = logging_config._queue_listeners
+
+            assert second is not first
+            assert second.running
+            assert not first.running
+            assert all(handler.target is None for handler in first.handlers)
+        finally:
+            stop_log_listeners()
+            for listener in logging_config._queue_listeners:
+                for handler in listener.handlers:
+                    handler.close()
+            root_logger.handlers[:] = saved_handlers
+            root_logger.setLevel(saved_level)
@@ -1,21 +1,36 @@
 import pytest
-import json
+import orjson
 import logging
 import tempfile
 import os
 from unittest.mock import Mock, patch, AsyncMock
 from fastapi import FastAPI, Request, Response
 from fastapi.testclient import TestClient
-from app.middleware.logging_middleware import RequestLoggingMiddleware, DetailedLoggingRoute
+from app.middleware.logging_middleware import RequestLoggingMiddleware, DetailedLoggingRoute, _decode
 from app.config import settings
 
 
+class _URL:
+    path = "/test"
+
+
+class _Req:
+    """Minimal request stand-in whose headers cannot be read."""
+    method = "POST"
+    url = _URL()
+    client = None
+    
+    @property
+    def headers(self):
+        raise RuntimeError("headers error")
+
+
 class TestRequestLoggingMiddleware:
     """Test cases for RequestLoggingMiddleware."""
     
-    @pytest.fixture
+    @pytest.fixture(scope="module")
     def app(self):
-        """Create a test FastAPI app with logging middleware."""
+        """Create a test FastAPI app with logging middleware, shared by the module."""
         app = FastAPI()
         app.add_middleware(RequestLoggingMiddleware, enable_request_logging=True)
         
@@ -33,9 +48,9 @@ class TestRequestLoggingMiddleware:
         
         return app
     
-    @pytest.fixture
+    @pytest.fixture(scope="module")
     def client(self, app):
-        """Create a test client."""
+        """Create a test client, shared by the module."""
         return TestClient(app)
     
     @pytest.fixture
@@ -64,9 +79,11 @@ class TestRequestLoggingMiddleware:
             return {"message": "test"}
         
         client = TestClient(app)
-        response = client.get("/test")
+        with patch.object(RequestLoggingMiddleware, '_extract_request_data') as mock_extract:
+            response = client.get("/test")
         
         assert response.status_code == 200
+        mock_extract.assert_not_called()
         mock_logger.info.assert_not_called()
     
     def test_health_check_endpoints_skipped(self, mock_logger):
@@ -109,14 +126,14 @@ class TestRequestLoggingMiddleware:
         
         # Check the logged data structure
         call_args = mock_logger.info.call_args[0][0]
-        log_data = json.loads(call_args)
+        log_data = _decode(orjson.loads(call_args))
         
         assert log_data["type"] == "http_request"
-        assert log_data["request"]["method"] == "GET"
-        assert log_data["request"]["path"] == "/test"
-        assert log_data["response"]["status_code"] == 200
-        assert "process_time" in log_data["response"]
-        assert "timestamp" in log_data
+        assert log_data["method"] == "GET"
+        assert log_data["path"] == "/test"
+        assert log_data["status"] == 200
+        assert log_data["process_time"] is not None
+        assert log_data["ts"] is not None
     
     def test_post_request_with_body_logging(self, client, mock_logger):
         """Test logging of POST requests (body logging is currently disabled)."""
@@ -127,11 +144,11 @@ class TestRequestLoggingMiddleware:
         mock_logger.info.assert_called_once()
         
         call_args = mock_logger.info.call_args[0][0]
-        log_data = json.loads(call_args)
+        log_data = _decode(orjson.loads(call_args))
         
-        assert log_data["request"]["method"] == "POST"
-        # Body should be None since body logging is disabled
-        assert log_data["request"]["body"] is None
+        assert log_data["method"] == "POST"
+        # The body is never part of the log entry
+        assert "secret123" not in call_args
     
     def test_sensitive_data_masking(self):
         """Test that sensitive data is properly masked."""
@@ -181,17 +198,12 @@ class TestRequestLoggingMiddleware:
         """Test error handling during request data extraction."""
         middleware = RequestLoggingMiddleware(Mock())
         
-        # Mock request that raises an exception
-        mock_request = Mock()
-        mock_request.method = "POST"
-        mock_request.url = Mock()
-        mock_request.url.path = "/test"
-        mock_request.url.__str__ = Mock(side_effect=Exception("URL error"))
-        
-        result = await middleware._extract_request_data(mock_request)
+        # Request whose headers raise when read
+        result = await middleware._extract_request_data(_Req())
         
-        assert "error" in result
         assert "Error extracting request data" in result["error"]
+        assert result["method"] == "POST"
+        assert result["path"] == "/test"
     
     def test_response_data_extraction(self):
         """Test response data extraction."""
@@ -203,9 +215,7 @@ class TestRequestLoggingMiddleware:
         
         result = middleware._extract_response_data(mock_response, 0.1234)
         
-        assert result["status_code"] == 200
-        assert result["headers"]["content-type"] == "application/json"
-        assert result["process_time"] == 0.1234
+        assert result == {"status_code": 200, "process_time": 0.1234}
     
     def test_log_entry_structure(self, mock_logger):
         """Test the structure of log entries."""
@@ -213,7 +223,6 @@ class TestRequestLoggingMiddleware:
         
         request_data = {
             "method": "GET",
-            "url": "http://test.com/api",
             "path": "/api"
         }
         
@@ -227,13 +236,15 @@ class TestRequestLoggingMiddleware:
         
         mock_logger.info.assert_called_once()
         call_args = mock_logger.info.call_args[0][0]
-        log_data = json.loads(call_args)
+        log_data = _decode(orjson.loads(call_args))
         
         # Verify log structure
         assert log_data["type"] == "http_request"
-        assert log_data["request"] == request_data
-        assert log_data["response"] == response_data
-        assert log_data["timestamp"] == 1234567890
+        assert log_data["method"] == request_data["method"]
+        assert log_data["path"] == request_data["path"]
+        assert log_data["status"] == response_data["status_code"]
+        assert log_data["process_time"] == response_data["process_time"]
+        assert log_data["ts"] == 1234567890
 
 
 class TestDetailedLoggingRoute:
@@ -270,28 +281,34 @@ class TestLoggingConfiguration:
     @patch('logging.getLogger')
     def test_logging_setup_creates_handlers(self, mock_get_logger, mock_stream, mock_rotating, mock_mkdir):
         """Test that logging setup creates all required handlers."""
-        from app.logging_config import setup_logging
+        from app.logging_config import setup_logging, stop_log_listeners
         
         # Mock the root logger
         mock_root_logger = Mock()
         mock_get_logger.return_value = mock_root_logger
         
-        # Mock settings
-        with patch('app.logging_config.settings') as mock_settings:
+        # Mock settings; keep the listener this starts away from the app's own
+        with patch('app.logging_config.settings') as mock_settings, \
+                patch('app.logging_config._queue_listeners', []):
             mock_settings.log_level = "INFO"
             mock_settings.log_format = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
             mock_settings.log_file_max_bytes = 10485760
             mock_settings.log_file_backup_count = 5
+            mock_settings.log_buffer_capacity = 4096
+            mock_settings.log_flush_interval = 1.0
             
-            result = setup_logging()
-            
-            # Verify directory creation
-            mock_mkdir.assert_called_once_with(exist_ok=True)
-            
-            # Verify handlers were created
-            assert mock_stream.called
-            assert mock_rotating.called
-            assert result == mock_root_logger
+            try:
+                result = setup_logging()
+                
+                # Verify directory creation
+                mock_mkdir.assert_called_once_with(exist_ok=True)
+                
+                # Verify handlers were created
+                assert mock_stream.called
+                assert mock_rotating.called
+                assert result == mock_root_logger
+            finally:
+                stop_log_listeners()
     
     def test_logging_configuration_with_settings(self):
         """Test logging configuration respects settings."""
@@ -382,9 +399,9 @@ class TestLoggingIntegration:
                     
                     # Verify the log data structure
                     call_args = mock_logger.info.call_args[0][0]
-                    log_data = json.loads(call_args)
+                    log_data = _decode(orjson.loads(call_args))
                     
                     assert log_data["type"] == "http_request"
-                    assert log_data["request"]["method"] == "GET"
-                    assert log_data["request"]["path"] == "/test-logging"
-                    assert log_data["response"]["status_code"] == 200
+                    assert log_data["method"] == "GET"
+                    assert log_data["path"] == "/test-logging"
+                    assert log_data["status"] == 200
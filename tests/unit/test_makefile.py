@@ -1,4 +1,5 @@
 # Tests for Makefile commands
+import hashlib
 import pytest
 import subprocess
 import os
@@ -6,28 +7,35 @@ import shutil
 from pathlib import Path
 from unittest.mock import patch, Mock
 
+MAKEFILE_DIR = Path(__file__).parent.parent.parent
+
+
+@pytest.fixture(scope="session")
+def make_runner():
+    """Run make with the given arguments from the repository root."""
+    def run(*args):
+        return subprocess.run(
+            ["make", *args],
+            capture_output=True,
+            text=True,
+            cwd=MAKEFILE_DIR
+        )
+    return run
+
 
 class TestMakefile:
     """Test cases for Makefile commands."""
 
     def test_makefile_exists(self):
         """Test that Makefile exists."""
-        makefile_path = Path(__file__).parent.parent.parent / "Makefile"
+        makefile_path = MAKEFILE_DIR / "Makefile"
         assert makefile_path.exists()
         assert makefile_path.is_file()
 
     @pytest.mark.skipif(not shutil.which("make"), reason="make command not available")
-    @pytest.mark.skipif(not shutil.which("make"), reason="make command not available")
-    def test_make_help(self):
+    def test_make_help(self, make_runner):
         """Test make help command."""
-        makefile_dir = Path(__file__).parent.parent.parent
-
-        result = subprocess.run(
-            ["make", "help"],
-            capture_output=True,
-            text=True,
-            cwd=makefile_dir
-        )
+        result = make_runner("help")
 
         assert result.returncode == 0
         assert "Docker FastAPI Auth Service - Available Commands:" in result.stdout
@@ -36,80 +44,43 @@ class TestMakefile:
         assert "backup-hash" in result.stdout
 
     @pytest.mark.skipif(not shutil.which("make"), reason="make command not available")
-    @pytest.mark.skipif(not shutil.which("make"), reason="make command not available")
-    def test_make_backup_hash_without_password(self):
+    def test_make_backup_hash_without_password(self, make_runner):
         """Test make backup-hash without password parameter."""
-        makefile_dir = Path(__file__).parent.parent.parent
-
-        result = subprocess.run(
-            ["make", "backup-hash"],
-            capture_output=True,
-            text=True,
-            cwd=makefile_dir
-        )
+        result = make_runner("backup-hash")
 
         assert result.returncode == 2  # Make error
         assert "PASSWORD" in result.stderr
 
     @pytest.mark.skipif(not shutil.which("make"), reason="make command not available")
-    @pytest.mark.skipif(not shutil.which("make"), reason="make command not available")
-    def test_make_backup_hash_with_password(self):
+    def test_make_backup_hash_with_password(self, make_runner):
         """Test make backup-hash with password parameter."""
-        makefile_dir = Path(__file__).parent.parent.parent
-
-        result = subprocess.run(
-            ["make", "backup-hash", "PASSWORD=test123"],
-            capture_output=True,
-            text=True,
-            cwd=makefile_dir
-        )
+        result = make_runner("backup-hash", "PASSWORD=test123")
 
         assert result.returncode == 0
         assert "SHA256 Hash for 'test123':" in result.stdout
-        expected_hash = "ecd71870d1963316a97e3ac3408c9835ad8cf0f3c1bc703527c30265534f75ae"
+        expected_hash = hashlib.sha256(b"test123").hexdigest()
         assert expected_hash in result.stdout
 
     @pytest.mark.skipif(not shutil.which("make"), reason="make command not available")
-    def test_make_backup_create_without_username(self):
+    def test_make_backup_create_without_username(self, make_runner):
         """Test make backup-create without username."""
-        makefile_dir = Path(__file__).parent.parent.parent
-
-        result = subprocess.run(
-            ["make", "backup-create", "PASSWORD=test123"],
-            capture_output=True,
-            text=True,
-            cwd=makefile_dir
-        )
+        result = make_runner("backup-create", "PASSWORD=test123")
 
         assert result.returncode == 2
         assert "USERNAME and PASSWORD are required" in result.stderr
 
     @pytest.mark.skipif(not shutil.which("make"), reason="make command not available")
-    def test_make_backup_create_without_password(self):
+    def test_make_backup_create_without_password(self, make_runner):
         """Test make backup-create without password."""
-        makefile_dir = Path(__file__).parent.parent.parent
-
-        result = subprocess.run(
-            ["make", "backup-create", "USERNAME=testuser"],
-            capture_output=True,
-            text=True,
-            cwd=makefile_dir
-        )
+        result = make_runner("backup-create", "USERNAME=testuser")
 
         assert result.returncode == 2
         assert "USERNAME and PASSWORD are required" in result.stderr
 
     @pytest.mark.skipif(not shutil.which("make"), reason="make command not available")
-    def test_make_backup_create_with_minimal_params(self):
+    def test_make_backup_create_with_minimal_params(self, make_runner):
         """Test make backup-create with minimal required parameters."""
-        makefile_dir = Path(__file__).parent.parent.parent
-
-        result = subprocess.run(
-            ["make", "backup-create", "USERNAME=testuser", "PASSWORD=testpass123"],
-            capture_output=True,
-            text=True,
-            cwd=makefile_dir
-        )
+        result = make_runner("backup-create", "USERNAME=testuser", "PASSWORD=testpass123")
 
         assert result.returncode == 0
         assert "Creating backup user configuration:" in result.stdout
@@ -117,16 +88,9 @@ class TestMakefile:
         assert "Password Hash:" in result.stdout
 
     @pytest.mark.skipif(not shutil.which("make"), reason="make command not available")
-    def test_make_backup_create_with_all_params(self):
+    def test_make_backup_create_with_all_params(self, make_runner):
         """Test make backup-create with all parameters."""
-        makefile_dir = Path(__file__).parent.parent.parent
-
-        result = subprocess.run(
-            ["make", "backup-create", "USERNAME=testuser", "PASSWORD=testpass123", "ADMIN=true", "PERMISSIONS={\"services\":[\"*\"]}"],
-            capture_output=True,
-            text=True,
-            cwd=makefile_dir
-        )
+        result = make_runner("backup-create", "USERNAME=testuser", "PASSWORD=testpass123", "ADMIN=true", "PERMISSIONS={\"services\":[\"*\"]}")
 
         assert result.returncode == 0
         assert "Username: testuser" in result.stdout
@@ -134,31 +98,17 @@ class TestMakefile:
         assert '"*"' in result.stdout
 
     @pytest.mark.skipif(not shutil.which("make"), reason="make command not available")
-    def test_make_backup_list(self):
+    def test_make_backup_list(self, make_runner):
         """Test make backup-list command."""
-        makefile_dir = Path(__file__).parent.parent.parent
-
-        result = subprocess.run(
-            ["make", "backup-list"],
-            capture_output=True,
-            text=True,
-            cwd=makefile_dir
-        )
+        result = make_runner("backup-list")
 
         assert result.returncode == 0
         assert "Current Backup Users Configuration:" in result.stdout
 
     @pytest.mark.skipif(not shutil.which("make"), reason="make command not available")
-    def test_make_backup_example(self):
+    def test_make_backup_example(self, make_runner):
         """Test make backup-example command."""
-        makefile_dir = Path(__file__).parent.parent.parent
-
-        result = subprocess.run(
-            ["make", "backup-example"],
-            capture_output=True,
-            text=True,
-            cwd=makefile_dir
-        )
+        result = make_runner("backup-example")
 
         assert result.returncode == 0
         assert "Example BACKUP_USERS configuration" in result.stdout
@@ -166,16 +116,9 @@ class TestMakefile:
         assert "operator" in result.stdout
 
     @pytest.mark.skipif(not shutil.which("make"), reason="make command not available")
-    def test_make_examples(self):
+    def test_make_examples(self, make_runner):
         """Test make examples command."""
-        makefile_dir = Path(__file__).parent.parent.parent
-
-        result = subprocess.run(
-            ["make", "examples"],
-            capture_output=True,
-            text=True,
-            cwd=makefile_dir
-        )
+        result = make_runner("examples")
 
         assert result.returncode == 0
         assert "Docker FastAPI Auth Service - Usage Examples:" in result.stdout
@@ -183,34 +126,19 @@ class TestMakefile:
         assert "make backup-create" in result.stdout
 
     @pytest.mark.skipif(not shutil.which("make"), reason="make command not available")
-    def test_make_status_without_services(self):
+    def test_make_status_without_services(self, make_runner):
         """Test make status when services are not running."""
-        makefile_dir = Path(__file__).parent.parent.parent
-
-        result = subprocess.run(
-            ["make", "status"],
-            capture_output=True,
-            text=True,
-            cwd=makefile_dir
-        )
+        result = make_runner("status")
 
         # This might fail if services aren't running, but we test the command structure
         # The important thing is that make doesn't fail with syntax errors
         assert result.returncode in [0, 1]  # 0 for success, 1 for service issues
 
     @pytest.mark.skipif(not shutil.which("make"), reason="make command not available")
-    def test_makefile_syntax(self):
+    def test_makefile_syntax(self, make_runner):
         """Test that Makefile has valid syntax."""
-        makefile_dir = Path(__file__).parent.parent.parent
-        makefile_path = makefile_dir / "Makefile"
-
-        # Check for basic syntax by trying to parse with make
-        result = subprocess.run(
-            ["make", "-n", "help"],  # -n means dry run
-            capture_output=True,
-            text=True,
-            cwd=makefile_dir
-        )
+        # Check for basic syntax by trying to parse with make (-n means dry run)
+        result = make_runner("-n", "help")
 
         # Should not have syntax errors
         assert "syntax error" not in result.stderr.lower()
@@ -1,8 +1,49 @@
 # Unit tests for OAuth service
+import httpx
 import pytest
-from unittest.mock import patch, AsyncMock
+from unittest.mock import patch
 from app.services.oauth_service import OAuthService
 
+# Captured before any test patches httpx.AsyncClient
+_RealAsyncClient = httpx.AsyncClient
+
+GITHUB_USER = {
+    "id": 12345,
+    "email": "test@example.com",
+    "login": "testuser",
+    "name": "Test User",
+    "avatar_url": "https://example.com/avatar.jpg"
+}
+
+GOOGLE_USER = {
+    "id": "google123",
+    "email": "test@example.com",
+    "name": "Test User",
+    "picture": "https://example.com/avatar.jpg"
+}
+
+def _oauth_handler(request):
+    """Answer the GitHub and Google OAuth endpoints the service calls."""
+    url = str(request.url)
+    if url in ("https://github.com/login/oauth/access_token", "https://oauth2.googleapis.com/token"):
+        return httpx.Response(200, json={"access_token": "test_token"})
+    if url == "https://api.github.com/user":
+        return httpx.Response(200, json=GITHUB_USER)
+    if url == "https://www.googleapis.com/oauth2/v2/userinfo":
+        return httpx.Response(200, json=GOOGLE_USER)
+    return httpx.Response(404)
+
+def _client_with(handler):
+    """Build an httpx.AsyncClient replacement whose requests are answered by handler."""
+    transport = httpx.MockTransport(handler)
+    return lambda **kwargs: _RealAsyncClient(transport=transport, **kwargs)
+
+@pytest.fixture
+def oauth_api():
+    """Serve the OAuth provider endpoints from _oauth_handler instead of the network."""
+    with patch('httpx.AsyncClient', _client_with(_oauth_handler)):
+        yield
+
 class TestOAuthService:
     def test_get_github_auth_url(self):
         """Test GitHub OAuth URL generation."""
@@ -29,91 +70,39 @@ class TestOAuthService:
         assert "state=test_state" in url
 
     @pytest.mark.asyncio
-    async def test_exchange_github_code_success(self):
+    async def test_exchange_github_code_success(self, oauth_api):
         """Test successful GitHub code exchange."""
         service = OAuthService()
 
-        # Mock the httpx client and responses
-        with patch('httpx.AsyncClient') as mock_client_class:
-            mock_client = AsyncMock()
-            mock_client_class.return_value.__aenter__.return_value = mock_client
-            mock_client_class.return_value.__aexit__.return_value = None
-
-            # Mock token response (use regular Mock for synchronous json method)
-            from unittest.mock import Mock
-            mock_token_response = Mock()
-            mock_token_response.json.return_value = {"access_token": "test_token"}
-            mock_client.post.return_value = mock_token_response
-
-            # Mock user response
-            mock_user_response = Mock()
-            mock_user_response.json.return_value = {
-                "id": 12345,
-                "email": "test@example.com",
-                "login": "testuser",
-                "name": "Test User",
-                "avatar_url": "https://example.com/avatar.jpg"
-            }
-            mock_client.get.return_value = mock_user_response
-
-            result = await service.exchange_github_code("test_code")
+        result = await service.exchange_github_code("test_code")
 
-            assert result is not None
-            assert result["email"] == "test@example.com"
-            assert result["username"] == "testuser"
-            assert result["full_name"] == "Test User"
-            assert result["provider"] == "github"
+        assert result is not None
+        assert result["email"] == "test@example.com"
+        assert result["username"] == "testuser"
+        assert result["full_name"] == "Test User"
+        assert result["provider"] == "github"
 
     @pytest.mark.asyncio
-    @patch('httpx.AsyncClient')
-    async def test_exchange_github_code_token_error(self, mock_client_class):
+    async def test_exchange_github_code_token_error(self):
         """Test GitHub code exchange with token request error."""
         service = OAuthService()
 
-        mock_client = AsyncMock()
-        mock_client_class.return_value.__aenter__.return_value = mock_client
-
-        # Mock failed token response with status_code check
-        mock_token_response = AsyncMock()
-        mock_token_response.status_code = 400  # Add status code
-        mock_token_response.json.side_effect = Exception("Token request failed")
-        mock_client.post.return_value = mock_token_response
-
-        result = await service.exchange_github_code("test_code")
+        # Failed token response without a JSON body
+        failing_token = _client_with(lambda request: httpx.Response(400, text="Token request failed"))
+        with patch('httpx.AsyncClient', failing_token):
+            result = await service.exchange_github_code("test_code")
 
         assert result is None
 
     @pytest.mark.asyncio
-    async def test_exchange_google_code_success(self):
+    async def test_exchange_google_code_success(self, oauth_api):
         """Test successful Google code exchange."""
         service = OAuthService()
 
-        # Mock the httpx client and responses
-        with patch('httpx.AsyncClient') as mock_client_class:
-            mock_client = AsyncMock()
-            mock_client_class.return_value.__aenter__.return_value = mock_client
-            mock_client_class.return_value.__aexit__.return_value = None
-
-            # Mock token response (use regular Mock for synchronous json method)
-            from unittest.mock import Mock
-            mock_token_response = Mock()
-            mock_token_response.json.return_value = {"access_token": "test_token"}
-            mock_client.post.return_value = mock_token_response
-
-            # Mock user response
-            mock_user_response = Mock()
-            mock_user_response.json.return_value = {
-                "id": "google123",
-                "email": "test@example.com",
-                "name": "Test User",
-                "picture": "https://example.com/avatar.jpg"
-            }
-            mock_client.get.return_value = mock_user_response
-
-            result = await service.exchange_google_code("test_code", "http://localhost:3000/callback/google")
-
-            assert result is not None
-            assert result["email"] == "test@example.com"
-            assert result["username"] == "test"  # Google username is email prefix
-            assert result["full_name"] == "Test User"
-            assert result["provider"] == "google"
+        result = await service.exchange_google_code("test_code", "http://localhost:3000/callback/google")
+
+        assert result is not None
+        assert result["email"] == "test@example.com"
+        assert result["username"] == "test"  # Google username is email prefix
+        assert result["full_name"] == "Test User"
+        assert result["provider"] == "google"
@@ -0,0 +1,67 @@
+# Unit tests for the orjson request/route classes
+import pytest
+from fastapi import APIRouter, FastAPI, Request
+from fastapi.testclient import TestClient
+from pydantic import BaseModel
+from app.routes.base import ORJSONRoute
+
+
+class Item(BaseModel):
+    name: str
+    tags: list[str]
+
+
+@pytest.fixture(scope="module")
+def client():
+    """Provide a client for a router built on ORJSONRoute."""
+    router = APIRouter(route_class=ORJSONRoute)
+
+    @router.post("/items")
+    async def create_item(item: Item):
+        return item
+
+    @router.post("/raw")
+    async def echo_raw(request: Request):
+        return {"cls": type(request).__name__, "body": await request.json()}
+
+    app = FastAPI()
+    app.include_router(router)
+    return TestClient(app)
+
+
+class TestORJSONRoute:
+    def test_body_round_trip(self, client):
+        """Test that a JSON body is parsed into the model and echoed back unchanged."""
+        item = {"name": "José 用户", "tags": ["a", "éé"]}
+        response = client.post("/items", json=item)
+
+        assert response.status_code == 200
+        assert response.json() == item
+
+    def test_endpoint_receives_orjson_request(self, client):
+        """Test that request.json() in the endpoint goes through ORJSONRequest."""
+        body = {"nested": {"n": 1, "f": 1.5, "none": None}}
+        response = client.post("/raw", json=body)
+
+        assert response.json() == {"cls": "ORJSONRequest", "body": body}
+
+    def test_malformed_json_returns_422(self, client):
+        """Test that invalid JSON still becomes a validation error pointing into the body."""
+        response = client.post(
+            "/items",
+            content=b'{"name": "x", "tags": [}',
+            headers={"Content-Type": "application/json"}
+        )
+
+        assert response.status_code == 422
+        (error,) = response.json()["detail"]
+        assert error["type"] == "json_invalid"
+        assert error["loc"][0] == "body"
+        assert isinstance(error["loc"][1], int)
+
+    def test_validation_error_loc(self, client):
+        """Test that well-formed JSON failing validation reports the field location."""
+        response = client.post("/items", json={"name": "x"})
+
+        assert response.status_code == 422
+        assert response.json()["detail"][0]["loc"] == ["body", "tags"]
@@ -1,64 +1,83 @@
 # Unit tests for token service
 import pytest
-from unittest.mock import patch
-from app.services.token_service import TokenService
+from unittest.mock import Mock, patch
+from app.services.token_service import TokenService, JWTError
 
-class TestTokenService:
-    def test_create_access_token(self):
-        """Test creating a valid access token."""
-        service = TokenService()
-        data = {"sub": "user123", "type": "access"}
-        token = service.create_access_token(data)
+# SHA-256 hex digest of "test_refresh_token"
+EXPECTED_REFRESH_HASH = "03e451bd5ed26b0b8bfb96c791065796457d6f21fbe53c033dd9d1ce4590f6c7"
 
-        assert token is not None
-        assert isinstance(token, str)
-        assert len(token) > 0
+@pytest.fixture(scope="session")
+def token_service():
+    """Provide one TokenService for the session; it holds only settings."""
+    return TokenService()
 
-    def test_verify_valid_access_token(self):
-        """Test verifying a valid access token."""
-        service = TokenService()
-        data = {"sub": "user123", "type": "access"}
-        token = service.create_access_token(data)
+@pytest.fixture(scope="session")
+def sample_access_token(token_service):
+    """Provide one signed access token for the read-only verification tests."""
+    return token_service.create_access_token({"sub": "user123", "type": "access"})
 
-        payload = service.verify_access_token(token)
-        assert payload is not None
-        assert payload["sub"] == "user123"
-        assert payload["type"] == "access"
+class TestTokenService:
+    @pytest.mark.parametrize("factory", [
+        lambda s: s.create_access_token({"sub": "user123", "type": "access"}),
+        lambda s: s.create_refresh_token(),
+        lambda s: s.hash_refresh_token("test_refresh_token"),
+    ], ids=["access_token", "refresh_token", "refresh_hash"])
+    def test_produces_nonempty_string(self, token_service, factory):
+        """Test that token creation and hashing return non-empty strings."""
+        out = factory(token_service)
+        assert out and isinstance(out, str)
 
-    def test_verify_invalid_access_token(self):
-        """Test that invalid tokens are rejected."""
-        service = TokenService()
-        payload = service.verify_access_token("invalid_token")
-        assert payload is None
+    @patch('app.services.token_service.jwt.encode', return_value="fake.jwt.token")
+    def test_create_access_token(self, mock_encode, token_service):
+        """Test that access token claims carry the subject and an expiry."""
+        token_service.create_access_token({"sub": "user123", "type": "access"})
 
-    def test_verify_access_token_jwt_decode_error(self):
-        """Test that JWT decoding errors are handled properly."""
-        service = TokenService()
-        
-        # Mock jwt.decode to raise JWTError
-        with patch('app.services.token_service.jwt.decode') as mock_decode:
-            from app.services.token_service import JWTError
-            mock_decode.side_effect = JWTError("Invalid token")
-            
-            payload = service.verify_access_token("any_token")
+        claims = mock_encode.call_args.args[0]
+        assert claims["sub"] == "user123"
+        assert claims["type"] == "access"
+        assert "exp" in claims
+
+    @pytest.mark.parametrize("token_factory,expected_sub", [
+        (lambda sample: sample, "user123"),
+        (lambda sample: "invalid_token", None),
+    ], ids=["valid", "invalid"])
+    def test_verify_access_token(self, token_service, sample_access_token, token_factory, expected_sub):
+        """Test that valid tokens are accepted and invalid tokens are rejected."""
+        payload = token_service.verify_access_token(token_factory(sample_access_token))
+
+        if expected_sub is None:
             assert payload is None
-            mock_decode.assert_called_once()
+        else:
+            assert payload is not None
+            assert payload["sub"] == expected_sub
+            assert payload["type"] == "access"
 
-    def test_create_refresh_token(self):
-        """Test creating a refresh token."""
-        service = TokenService()
-        token = service.create_refresh_token()
+    def test_verify_access_token_jwt_decode_error(self, token_service, monkeypatch):
+        """Test that JWT decoding errors are handled properly."""
+        # Make jwt.decode raise JWTError
+        mock_decode = Mock(side_effect=JWTError("Invalid token"))
+        monkeypatch.setattr('app.services.token_service.jwt.decode', mock_decode)
 
-        assert token is not None
-        assert isinstance(token, str)
-        assert len(token) > 0
+        payload = token_service.verify_access_token("any_token")
+        assert payload is None
+        assert mock_decode.call_count == 1
 
-    def test_hash_refresh_token(self):
+    def test_hash_refresh_token(self, token_service):
         """Test hashing a refresh token."""
-        service = TokenService()
         token = "test_refresh_token"
-        hashed = service.hash_refresh_token(token)
+        hashed = token_service.hash_refresh_token(token)
 
-        assert hashed is not None
-        assert isinstance(hashed, str)
         assert len(hashed) == 64  # SHA256 hex length
+        assert hashed == EXPECTED_REFRESH_HASH
+
+    @pytest.mark.performance
+    def test_hash_refresh_token_bench(self, token_service, benchmark):
+        """Guard refresh token hashing throughput for a 1 KiB input."""
+        result = benchmark(token_service.hash_refresh_token, "x" * 1024)
+        assert len(result) == 64
+
+        # hashlib takes ~1-7us here depending on SHA extension support;
+        # a pure-Python or key-stretching hash would be orders of magnitude slower.
+        # With --benchmark-disable (or under xdist) there are no stats.
+        if not benchmark.disabled:
+            assert benchmark.stats.stats.mean < 5e-5